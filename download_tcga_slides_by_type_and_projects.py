@@ -1,12 +1,16 @@
 import requests
+from requests.adapters import HTTPAdapter
 import json
 import os
+import sys
 from pathlib import Path
-from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 import csv
 import argparse
+import tarfile
 import hashlib
 import logging
+import time
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 import pandas as pd
 
@@ -23,9 +27,40 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 GDC_API_ENDPOINT = "https://api.gdc.cancer.gov"
+
+# Shared HTTP session so repeated GDC API calls reuse keep-alive connections
+# instead of paying a TCP+TLS handshake per request
+def _make_session():
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(pool_connections=16, pool_maxsize=64, max_retries=0))
+    session.headers["Connection"] = "keep-alive"
+    return session
+
+SESSION = _make_session()
+
+def _init_worker():
+    # Forked workers must not reuse the parent's pooled sockets
+    global SESSION
+    SESSION = _make_session()
+
 BASE_DIR = "tcga_data"
 METADATA_DIR = os.path.join(BASE_DIR, "metadata")
 SLIDES_DIR = os.path.join(BASE_DIR, "slides")
+# The project list changes rarely (monthly at most), so cache it on disk and
+# only refetch when the cache is stale or --refresh-projects is passed
+PROJECTS_CACHE_PATH = os.path.join(BASE_DIR, ".projects_cache.json")
+PROJECTS_CACHE_TTL_SECONDS = 7 * 24 * 3600
+MAX_DOWNLOAD_WORKERS = 8
+# 1 MiB download chunks: an 8 KiB chunk means ~256k write syscalls for a 2 GiB
+# slide, so each chunk should carry meaningful work
+DOWNLOAD_CHUNK_SIZE = 1 << 20
+# Batch several files into one POST /data request so small slides share a
+# single round trip; cap batch size so one failure doesn't waste much work
+BATCH_MAX_FILES = 10
+BATCH_MAX_BYTES = 1 << 30
+# Maps download_type to the experimental_strategy it selects; "both" and
+# "none" map to None, meaning no per-file strategy filter
+STRATEGY_BY_DOWNLOAD_TYPE = {"tissue": "Tissue Slide", "diagnostic": "Diagnostic Slide"}
 FALLBACK_PROJECTS = [
     "TCGA-BLCA", "TCGA-BRCA", "TCGA-CESC", "TCGA-COAD", "TCGA-LUAD",
     "TCGA-LUSC", "TCGA-PAAD", "TCGA-PRAD", "TCGA-READ", "TCGA-SKCM",
@@ -33,7 +68,16 @@ FALLBACK_PROJECTS = [
     "TCGA-LIHC", "TCGA-OV", "TCGA-THCA"
 ]
 
-def get_all_projects():
+def get_all_projects(refresh=False):
+    if not refresh:
+        try:
+            if time.time() - os.path.getmtime(PROJECTS_CACHE_PATH) < PROJECTS_CACHE_TTL_SECONDS:
+                with open(PROJECTS_CACHE_PATH) as f:
+                    projects = json.load(f)
+                logger.info(f"Loaded {len(projects)} TCGA projects from cache: {PROJECTS_CACHE_PATH}")
+                return projects
+        except (OSError, ValueError):
+            pass
     logger.info("Fetching all TCGA projects with slide images from GDC API")
     url = f"{GDC_API_ENDPOINT}/projects"
     params = {
@@ -49,7 +93,7 @@ def get_all_projects():
         "size": 1000
     }
     try:
-        response = requests.get(url, params=params, timeout=30)
+        response = SESSION.get(url, params=params, timeout=30)
         response.raise_for_status()
         projects = []
         for hit in response.json()["data"]["hits"]:
@@ -58,9 +102,13 @@ def get_all_projects():
                 projects.append(hit["project_id"])
         if not projects:
             logger.warning("No TCGA projects with slide images found via API. Using fallback project list.")
-            projects = FALLBACK_PROJECTS
+            return FALLBACK_PROJECTS
         logger.info(f"Found {len(projects)} TCGA projects with slide images: {', '.join(sorted(projects))}")
-        return sorted(projects)
+        projects = sorted(projects)
+        Path(BASE_DIR).mkdir(parents=True, exist_ok=True)
+        with open(PROJECTS_CACHE_PATH, "w") as f:
+            json.dump(projects, f)
+        return projects
     except Exception as e:
         logger.error(f"Failed to fetch TCGA projects: {str(e)}. Using fallback project list.")
         return FALLBACK_PROJECTS
@@ -77,98 +125,246 @@ def create_directories(project_id, download_type):
 def get_manifest(project_id):
     logger.info(f"Fetching manifest for {project_id}")
     url = f"{GDC_API_ENDPOINT}/files"
-    params = {
-        "filters": json.dumps({
-            "op": "and",
-            "content": [
-                {"op": "=", "content": {"field": "cases.project.project_id", "value": project_id}},
-                {"op": "=", "content": {"field": "data_category", "value": "Biospecimen"}},
-                {"op": "=", "content": {"field": "data_type", "value": "Slide Image"}}
-            ]
-        }),
-        "fields": "file_id,file_name,md5sum,case_id,file_size,data_format,experimental_strategy,cases.submitter_id",
-        "format": "json",
-        "size": 10000
-    }
-    response = requests.get(url, params=params)
-    response.raise_for_status()
-    return response.json()
-
-def group_by_patient(files, download_type, patient_ids=None):
-    patient_slides = defaultdict(list)
-    for file in files:
-        experimental_strategy = file.get("experimental_strategy", "")
-        if download_type == "tissue" and experimental_strategy != "Tissue Slide":
-            continue
-        if download_type == "diagnostic" and experimental_strategy != "Diagnostic Slide":
-            continue
-        case_id = file.get("case_id")
-        submitter_id = file.get("cases", [{}])[0].get("submitter_id", "Unknown")
-        identifier = case_id or submitter_id
-        # Filter by patient IDs if provided
-        if patient_ids and identifier not in patient_ids:
-            continue
-        patient_slides[identifier].append(file)
-    return patient_slides
+    filters = json.dumps({
+        "op": "and",
+        "content": [
+            {"op": "=", "content": {"field": "cases.project.project_id", "value": project_id}},
+            {"op": "=", "content": {"field": "data_category", "value": "Biospecimen"}},
+            {"op": "=", "content": {"field": "data_type", "value": "Slide Image"}}
+        ]
+    })
+    # Page through the results instead of relying on a single large "size":
+    # a hard cap silently truncates manifests for the biggest projects
+    hits = []
+    page_size = 1000
+    start = 0
+    while True:
+        params = {
+            "filters": filters,
+            "fields": "file_id,file_name,md5sum,case_id,file_size,data_format,experimental_strategy,cases.submitter_id",
+            "format": "json",
+            "size": page_size,
+            "from": start
+        }
+        response = SESSION.get(url, params=params)
+        response.raise_for_status()
+        data = response.json()["data"]
+        hits.extend(data["hits"])
+        pagination = data.get("pagination", {})
+        if not data["hits"] or pagination.get("page", 1) >= pagination.get("pages", 1):
+            break
+        start += page_size
+    logger.info(f"Fetched manifest for {project_id}: {len(hits)} files")
+    return hits
+
+def group_by_patient(files, download_type, patient_ids_set=None):
+    if not files:
+        return {}
+    # Filter and group through pandas masks instead of a per-file Python loop;
+    # the original dicts ride along in a column so metadata and downloads keep
+    # the full GDC records
+    df = pd.DataFrame([
+        (file,
+         file.get("experimental_strategy", ""),
+         file.get("case_id") or file.get("cases", [{}])[0].get("submitter_id", "Unknown"))
+        for file in files
+    ], columns=["slide", "experimental_strategy", "identifier"])
+    # Resolve the download_type dispatch to a single wanted strategy up front
+    wanted = STRATEGY_BY_DOWNLOAD_TYPE.get(download_type)
+    if wanted is not None:
+        df = df[df["experimental_strategy"] == wanted]
+    # Filter by patient IDs if provided
+    if patient_ids_set:
+        df = df[df["identifier"].isin(patient_ids_set)]
+    return {identifier: group["slide"].tolist() for identifier, group in df.groupby("identifier", sort=False)}
+
+def scan_existing_slides():
+    # Walk the slides tree once so re-runs can skip completed files from an
+    # in-memory size map instead of issuing a stat per manifest file
+    existing = {}
+    if not os.path.isdir(SLIDES_DIR):
+        return existing
+    for dirpath, _, filenames in os.walk(SLIDES_DIR):
+        for name in filenames:
+            path = os.path.join(dirpath, name)
+            existing[os.path.relpath(path, SLIDES_DIR)] = os.path.getsize(path)
+    if existing:
+        logger.info(f"Found {len(existing)} existing slide files under {SLIDES_DIR}")
+    return existing
 
 def save_metadata(project_id, identifier, slides, project_metadata_dir):
     output_path = os.path.join(project_metadata_dir, f"{identifier}.json")
     with open(output_path, "w") as f:
-        json.dump(slides, f, indent=2)
+        # Compact separators: these files are machine-consumed, and pretty-printing
+        # triples their size across thousands of patients
+        json.dump(slides, f, separators=(",", ":"))
     logger.info(f"Saved metadata for {project_id}, patient {identifier} ({len(slides)} slides)")
 
+def _md5_of_file(path):
+    with open(path, "rb") as f:
+        if sys.version_info >= (3, 11):
+            # file_digest hashes through an optimized C loop and releases the
+            # GIL, so downloader threads keep running during verification
+            return hashlib.file_digest(f, "md5").hexdigest()
+        md5_hash = hashlib.md5()
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            md5_hash.update(chunk)
+        return md5_hash.hexdigest()
+
+def _verify_or_skip(project_id, file_name, identifier, output_path, md5sum, file_size, verify):
+    # Returns True when the existing file can be kept; a size comparison
+    # against the manifest catches truncated/partial downloads without reading
+    # the file, so the chunked MD5 pass only runs when --verify is requested
+    if not os.path.exists(output_path):
+        return False
+    if os.path.getsize(output_path) != file_size:
+        logger.warning(f"Size mismatch for {file_name} for {project_id}, patient {identifier}, re-downloading")
+        return False
+    if verify:
+        if _md5_of_file(output_path) != md5sum:
+            logger.warning(f"Checksum mismatch for {file_name} for {project_id}, patient {identifier}, re-downloading")
+            return False
+        logger.info(f"Skipping {file_name} for {project_id}, patient {identifier}, already exists with matching MD5 checksum")
+        return True
+    logger.info(f"Skipping {file_name} for {project_id}, patient {identifier}, already exists with matching size")
+    return True
+
 @retry(
     stop=stop_after_attempt(3),
     wait=wait_exponential(multiplier=1, min=4, max=10),
     retry=retry_if_exception_type((requests.exceptions.RequestException,)),
     before_sleep=lambda retry_state: logger.warning(f"Retrying download (attempt {retry_state.attempt_number})...")
 )
-def download_file(project_id, file_id, file_name, identifier, md5sum, project_slides_dir):
-    patient_dir = os.path.join(project_slides_dir, identifier)
-    Path(patient_dir).mkdir(exist_ok=True)
-    output_path = os.path.join(patient_dir, file_name)
-    
-    # Check if file exists and verify checksum
-    if os.path.exists(output_path):
-        with open(output_path, "rb") as f:
-            file_content = f.read()
-            computed_md5 = hashlib.md5(file_content).hexdigest()
-        if computed_md5 == md5sum:
-            logger.info(f"Skipping {file_name} for {project_id}, patient {identifier}, already exists with matching MD5 checksum")
-            return
-        else:
-            logger.warning(f"Checksum mismatch for {file_name} for {project_id}, patient {identifier}, re-downloading")
-    
-    # Download file
-    logger.info(f"Downloading {file_name} for {project_id}, patient {identifier}")
-    url = f"{GDC_API_ENDPOINT}/data/{file_id}"
-    response = requests.get(url, stream=True, timeout=30)
+def _do_download(url, output_path):
+    response = SESSION.get(url, stream=True, timeout=30)
     response.raise_for_status()
-    with open(output_path, "wb") as f:
-        for chunk in response.iter_content(chunk_size=8192):
+    with open(output_path, "wb", buffering=DOWNLOAD_CHUNK_SIZE) as f:
+        if hasattr(os, "posix_fadvise"):
+            # Hint the page cache that this is a one-shot sequential write
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
             f.write(chunk)
+
+def download_file(project_id, file_id, file_name, identifier, md5sum, file_size, project_slides_dir, verify=False):
+    # Patient directories are created once per project before downloads start
+    output_path = os.path.join(project_slides_dir, identifier, file_name)
+
+    # Verify once up front; only the network portion below is retried, so a
+    # transient failure never re-hashes a multi-GB file
+    if _verify_or_skip(project_id, file_name, identifier, output_path, md5sum, file_size, verify):
+        return
+
+    logger.info(f"Downloading {file_name} for {project_id}, patient {identifier}")
+    _do_download(f"{GDC_API_ENDPOINT}/data/{file_id}", output_path)
     logger.info(f"Downloaded {file_name} for {project_id}, patient {identifier}")
 
+def batch_download_tasks(download_tasks):
+    batches = []
+    batch = []
+    batch_bytes = 0
+    for task in download_tasks:
+        batch.append(task)
+        batch_bytes += task[4]
+        if len(batch) >= BATCH_MAX_FILES or batch_bytes >= BATCH_MAX_BYTES:
+            batches.append(batch)
+            batch = []
+            batch_bytes = 0
+    if batch:
+        batches.append(batch)
+    return batches
+
+def download_files_batch(project_id, batch, project_slides_dir):
+    # A single file gains nothing from the archive round trip
+    if len(batch) == 1:
+        file_id, file_name, identifier, md5sum, file_size = batch[0]
+        download_file(project_id, file_id, file_name, identifier, md5sum, file_size, project_slides_dir)
+        return
+
+    # POST the whole batch to the /data endpoint so the files arrive as one
+    # tar.gz stream over a single request, then unpack members as they arrive
+    by_file_id = {task[0]: task for task in batch}
+    pending = set(by_file_id)
+    logger.info(f"Downloading batch of {len(batch)} files for {project_id}")
+    try:
+        response = SESSION.post(f"{GDC_API_ENDPOINT}/data", json={"ids": list(by_file_id)}, stream=True, timeout=30)
+        response.raise_for_status()
+        with tarfile.open(fileobj=response.raw, mode="r|gz") as archive:
+            for member in archive:
+                if not member.isfile():
+                    continue
+                # Members are laid out as <file_id>/<file_name>; anything else
+                # (e.g. MANIFEST.txt) is not ours
+                task = by_file_id.get(member.name.split("/", 1)[0])
+                if task is None:
+                    continue
+                file_id, file_name, identifier, md5sum, file_size = task
+                output_path = os.path.join(project_slides_dir, identifier, file_name)
+                md5_hash = hashlib.md5()
+                source = archive.extractfile(member)
+                with open(output_path, "wb", buffering=DOWNLOAD_CHUNK_SIZE) as f:
+                    for chunk in iter(lambda: source.read(DOWNLOAD_CHUNK_SIZE), b""):
+                        md5_hash.update(chunk)
+                        f.write(chunk)
+                if md5_hash.hexdigest() == md5sum:
+                    pending.discard(file_id)
+                    logger.info(f"Downloaded {file_name} for {project_id}, patient {identifier}")
+                else:
+                    logger.warning(f"Checksum mismatch for {file_name} in batch for {project_id}, patient {identifier}, retrying individually")
+                    os.remove(output_path)
+    except Exception as e:
+        logger.warning(f"Batch download failed for {project_id}: {str(e)}. Falling back to per-file downloads")
+
+    # Anything the archive did not deliver intact goes through the per-file
+    # path; one file exhausting its retries must not abandon the rest
+    for file_id in pending:
+        _, file_name, identifier, md5sum, file_size = by_file_id[file_id]
+        try:
+            download_file(project_id, file_id, file_name, identifier, md5sum, file_size, project_slides_dir)
+        except Exception as e:
+            logger.error(f"Failed to download {file_name} for {project_id}, patient {identifier}: {str(e)}")
+
 def generate_project_summary_csv(project_id, patient_slides):
     csv_path = os.path.join(BASE_DIR, f"{project_id}_summary.csv")
-    total_files = sum(len(slides) for slides in patient_slides.values())
-    total_size_bytes = sum(file.get("file_size", 0) for slides in patient_slides.values() for file in slides)
-    total_size_mb = total_size_bytes / (1024 * 1024)
-    formats = set(file.get("data_format", "Unknown") for slides in patient_slides.values() for file in slides)
-    tissue_slides = sum(1 for slides in patient_slides.values() for file in slides if file.get("experimental_strategy") == "Tissue Slide")
-    diagnostic_slides = sum(1 for slides in patient_slides.values() for file in slides if file.get("experimental_strategy") == "Diagnostic Slide")
-    
+    # Flatten the grouped slides into a DataFrame and aggregate vectorially
+    df = pd.DataFrame([
+        {
+            "identifier": identifier,
+            "file_size": file.get("file_size", 0),
+            "data_format": file.get("data_format", "Unknown"),
+            "experimental_strategy": file.get("experimental_strategy", "")
+        }
+        for identifier, slides in patient_slides.items() for file in slides
+    ], columns=["identifier", "file_size", "data_format", "experimental_strategy"])
+    df["tissue"] = df["experimental_strategy"] == "Tissue Slide"
+    df["diagnostic"] = df["experimental_strategy"] == "Diagnostic Slide"
+
+    total_files = len(df)
+    total_size_mb = df["file_size"].sum() / (1024 * 1024)
+    formats = set(df["data_format"].unique())
+    tissue_slides = int(df["tissue"].sum())
+    diagnostic_slides = int(df["diagnostic"].sum())
+
+    patient_stats = df.groupby("identifier", sort=True).agg(
+        num_slides=("identifier", "size"),
+        tissue=("tissue", "sum"),
+        diagnostic=("diagnostic", "sum"),
+        size_mb=("file_size", "sum")
+    )
+    patient_stats["size_mb"] /= 1024 * 1024
+
     with open(csv_path, "w", newline="") as f:
         writer = csv.writer(f)
         writer.writerow(["Project", "Total Patients", "Total Slides", "Tissue Slides", "Diagnostic Slides", "Total Size (MB)", "File Formats"])
         writer.writerow([project_id, len(patient_slides), total_files, tissue_slides, diagnostic_slides, f"{total_size_mb:.2f}", ", ".join(formats)])
         writer.writerow([])
-        writer.writerow(["Patient ID", "Number of Slides", "Tissue Slides", "Diagnostic Slides", "Size (MB)"])
-        for identifier, slides in sorted(patient_slides.items()):
-            patient_size_mb = sum(file.get("file_size", 0) for file in slides) / (1024 * 1024)
-            patient_tissue = sum(1 for file in slides if file.get("experimental_strategy") == "Tissue Slide")
-            patient_diagnostic = sum(1 for file in slides if file.get("experimental_strategy") == "Diagnostic Slide")
-            writer.writerow([identifier, len(slides), patient_tissue, patient_diagnostic, f"{patient_size_mb:.2f}"])
+    # Append the per-patient table through pandas' C-level CSV writer rather
+    # than one csv.writer callback per row
+    patient_stats.to_csv(
+        csv_path, mode="a",
+        index_label="Patient ID",
+        header=["Number of Slides", "Tissue Slides", "Diagnostic Slides", "Size (MB)"],
+        float_format="%.2f"
+    )
     
     logger.info(f"Generated project summary CSV for {project_id}: {csv_path}")
     logger.info(f"Summary for {project_id}:")
@@ -211,12 +407,12 @@ def generate_all_projects_summary_csv(project_summaries):
             ])
     logger.info(f"Generated all projects summary CSV: {csv_path}")
 
-def download_tcga_slides(download_type="both", projects="all", patient_ids=None):
+def download_tcga_slides(download_type="both", projects="all", patient_ids=None, verify=False, refresh_projects=False):
     if download_type not in ["tissue", "diagnostic", "both", "none"]:
         raise ValueError("download_type must be 'tissue', 'diagnostic', 'both', or 'none'")
-    
+
     # Fetch all TCGA projects with slide images
-    all_projects = get_all_projects()
+    all_projects = get_all_projects(refresh=refresh_projects)
     
     if not all_projects:
         raise ValueError("No TCGA projects with slide images available. Check GDC API or network connection.")
@@ -225,7 +421,8 @@ def download_tcga_slides(download_type="both", projects="all", patient_ids=None)
         project_list = all_projects
     else:
         project_list = [p.strip() for p in projects.split(",")]
-        invalid_projects = [p for p in project_list if p not in all_projects]
+        all_projects_set = set(all_projects)
+        invalid_projects = [p for p in project_list if p not in all_projects_set]
         if invalid_projects:
             raise ValueError(f"Invalid project(s): {', '.join(invalid_projects)}. Available projects: {', '.join(all_projects)}")
     
@@ -246,43 +443,89 @@ def download_tcga_slides(download_type="both", projects="all", patient_ids=None)
     else:
         patient_id_list = None
         logger.info("No patient IDs specified, processing all patients")
-    
-    project_summaries = []
-    for project_id in project_list:
-        logger.info(f"Processing {project_id}...")
-        project_metadata_dir, project_slides_dir = create_directories(project_id, download_type)
-        try:
-            manifest = get_manifest(project_id)
-            files = manifest["data"]["hits"]
-            patient_slides = group_by_patient(files, download_type if download_type != "none" else "both", patient_id_list)
-            
-            if not patient_slides:
-                logger.warning(f"No matching slides found for {project_id} with specified patient IDs")
-            
-            for identifier, slides in patient_slides.items():
-                save_metadata(project_id, identifier, slides, project_metadata_dir)
-                if download_type != "none":
-                    for file in slides:
-                        if (download_type == "tissue" and file.get("experimental_strategy") != "Tissue Slide") or \
-                           (download_type == "diagnostic" and file.get("experimental_strategy") != "Diagnostic Slide"):
-                            continue
-                        file_id = file["file_id"]
-                        file_name = file["file_name"]
-                        md5sum = file["md5sum"]
-                        try:
-                            download_file(project_id, file_id, file_name, identifier, md5sum, project_slides_dir)
-                        except Exception as e:
-                            logger.error(f"Failed to download {file_name} for {project_id}, patient {identifier}: {str(e)}")
-                            continue
-            
-            project_summary = generate_project_summary_csv(project_id, patient_slides)
-            project_summaries.append(project_summary)
+
+    # Membership checks happen once per manifest file, so use a set
+    patient_ids_set = set(patient_id_list) if patient_id_list else None
+
+
+    existing_sizes = scan_existing_slides() if download_type != "none" else {}
+
+    # Projects are independent, so fan them out over a process pool; each
+    # worker still runs its own thread pool for the downloads
+    if len(project_list) > 1:
+        max_procs = min(len(project_list), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=max_procs, initializer=_init_worker) as pool:
+            futures = [
+                pool.submit(_process_project, project_id, download_type, patient_ids_set, verify, existing_sizes)
+                for project_id in project_list
+            ]
+            project_summaries = [future.result() for future in futures]
+    else:
+        project_summaries = [
+            _process_project(project_id, download_type, patient_ids_set, verify, existing_sizes)
+            for project_id in project_list
+        ]
+    generate_all_projects_summary_csv([summary for summary in project_summaries if summary])
+
+def _process_project(project_id, download_type, patient_ids_set, verify, existing_sizes):
+    logger.info(f"Processing {project_id}...")
+    project_metadata_dir, project_slides_dir = create_directories(project_id, download_type)
+    try:
+        files = get_manifest(project_id)
+        patient_slides = group_by_patient(files, download_type if download_type != "none" else "both", patient_ids_set)
         
-        except Exception as e:
-            logger.error(f"Failed to process {project_id}: {str(e)}")
-            continue
-    
-    generate_all_projects_summary_csv(project_summaries)
+        if not patient_slides:
+            logger.warning(f"No matching slides found for {project_id} with specified patient IDs")
+        
+        download_tasks = []
+        # Resolve the download_type dispatch once rather than branching on it
+        # for every file
+        wanted = STRATEGY_BY_DOWNLOAD_TYPE.get(download_type)
+        for identifier, slides in patient_slides.items():
+            save_metadata(project_id, identifier, slides, project_metadata_dir)
+            if download_type != "none":
+                # One mkdir per patient here rather than one per download
+                # task inside the worker threads
+                os.makedirs(os.path.join(project_slides_dir, identifier), exist_ok=True)
+                for file in slides:
+                    if wanted is not None and file.get("experimental_strategy") != wanted:
+                        continue
+                    file_name = file["file_name"]
+                    file_size = file.get("file_size", 0)
+                    # Completed files are skipped from the pre-scan map; only
+                    # --verify runs submit them for the MD5 pass
+                    if not verify and existing_sizes.get(os.path.join(project_id, identifier, file_name)) == file_size:
+                        logger.info(f"Skipping {file_name} for {project_id}, patient {identifier}, already exists with matching size")
+                        continue
+                    download_tasks.append((file["file_id"], file_name, identifier, file["md5sum"], file_size))
+
+        # Downloads are network-bound, so run them concurrently; the shared
+        # session lets workers reuse keep-alive connections
+        if download_tasks:
+            with ThreadPoolExecutor(max_workers=MAX_DOWNLOAD_WORKERS) as executor:
+                if verify:
+                    # --verify relies on download_file's per-file skip/hash
+                    # logic, so batching is bypassed
+                    futures = {
+                        executor.submit(download_file, project_id, file_id, file_name, identifier, md5sum, file_size, project_slides_dir, verify): f"{file_name}, patient {identifier}"
+                        for file_id, file_name, identifier, md5sum, file_size in download_tasks
+                    }
+                else:
+                    futures = {
+                        executor.submit(download_files_batch, project_id, batch, project_slides_dir): f"batch of {len(batch)} files"
+                        for batch in batch_download_tasks(download_tasks)
+                    }
+                for future in as_completed(futures):
+                    try:
+                        future.result()
+                    except Exception as e:
+                        logger.error(f"Failed to download {futures[future]} for {project_id}: {str(e)}")
+        
+        return generate_project_summary_csv(project_id, patient_slides)
+
+    except Exception as e:
+        logger.error(f"Failed to process {project_id}: {str(e)}")
+        return None
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Download TCGA metadata and slides by type, projects, and patient IDs.")
@@ -292,6 +535,10 @@ if __name__ == "__main__":
                         help="Comma-separated TCGA project IDs (e.g., TCGA-BLCA,TCGA-BRCA) or 'all' for all available projects with slide images")
     parser.add_argument("--patient-ids", default=None,
                         help="Path to a CSV file with 'Patient ID' column or comma-separated patient IDs (e.g., TCGA-XX-XXXX,TCGA-YY-YYYY)")
+    parser.add_argument("--verify", action="store_true",
+                        help="MD5-verify existing files instead of trusting a matching file size")
+    parser.add_argument("--refresh-projects", action="store_true",
+                        help="Refetch the TCGA project list from the GDC API instead of using the on-disk cache")
     args = parser.parse_args()
-    
-    download_tcga_slides(args.download_type, args.projects, args.patient_ids)
\ No newline at end of file
+
+    download_tcga_slides(args.download_type, args.projects, args.patient_ids, args.verify, args.refresh_projects)
\ No newline at end of file